@@ -1,17 +1,67 @@
 # ds3231.py - Library untuk DS3231 Real Time Clock
 
 from machine import Pin, I2C, RTC
+from micropython import const
 import time # Menggunakan time untuk time.mktime dan time.localtime
 
 # Alamat I2C default untuk DS3231
-DS3231_I2C_ADDR = 0x68
+DS3231_I2C_ADDR = const(0x68)
+_TIME_REG = const(0x00) # Register detik, awal blok waktu 0x00..0x06
+_TEMP_REG = const(0x11) # Register MSB suhu, diikuti LSB di 0x12
+
+# Tabel konversi BCD <-> desimal, dihitung sekali saat modul dimuat
+_BCD2DEC = bytes(((i >> 4) * 10 + (i & 0x0F)) for i in range(256))
+_DEC2BCD = bytes(((d // 10) << 4) | (d % 10) for d in range(100))
+
+# Tabel konversi hari dalam minggu antar konvensi
+# Konvensi kita: 0=Minggu, ..., 6=Sabtu
+# DS3231: 1=Minggu, ..., 7=Sabtu (indeks 0 tidak valid, dipetakan ke Minggu)
+# mktime / RTC.datetime(): 0=Senin, ..., 6=Minggu
+_DS_TO_PY = b'\x00\x00\x01\x02\x03\x04\x05\x06'
+_PY_TO_DS = b'\x01\x02\x03\x04\x05\x06\x07'
+_PY_TO_MKTIME = b'\x06\x00\x01\x02\x03\x04\x05'
+_MKTIME_TO_PY = b'\x01\x02\x03\x04\x05\x06\x00'
+
+def _decode_hour(hour_byte):
+    # Register jam bisa dalam mode 12 jam (bit 6) atau 24 jam
+    if hour_byte & 0x40:
+        hour = _BCD2DEC[hour_byte & 0x1F]
+        if hour_byte & 0x80:
+            if hour != 12: hour += 12
+        else:
+            if hour == 12: hour = 0
+        return hour
+    return _BCD2DEC[hour_byte & 0x3F]
+
+def _decode_temperature_q2(temp_msb, temp_lsb):
+    # Suhu dalam satuan 0.25 °C: MSB bagian bulat, 2 bit teratas LSB bagian pecahan
+    return (temp_msb << 2) | (temp_lsb >> 6)
 
 class DS3231:
-    def __init__(self, pin_sda=21, pin_scl=22, freq=400000):
+    def __init__(self, pin_sda=21, pin_scl=22, freq=400000, verbose=False, fast_mode_plus=False, probe=True):
+        # Datasheet DS3231 hanya menjamin Fast-mode 400 kHz. Dengan fast_mode_plus=True bus dijalankan
+        # pada 1 MHz (di luar spesifikasi, biasanya stabil untuk kabel pendek) sehingga pembacaan
+        # 7 byte waktu turun dari ~180 us ke ~80 us. Gunakan 400 kHz untuk kabel yang panjang.
+        if fast_mode_plus:
+            freq = 1000000
         i2c = I2C(1, scl=Pin(pin_scl), sda=Pin(pin_sda), freq=freq) 
         self.i2c = i2c
-        if DS3231_I2C_ADDR not in self.i2c.scan():
-            raise RuntimeError("DS3231 tidak ditemukan pada bus I2C. Pastikan koneksi benar.")
+        # Cukup satu pembacaan 1 byte ke alamat DS3231, bukan scan() ke seluruh 128 alamat.
+        # Gunakan probe=False untuk melewati pengecekan ini (misalnya setelah boot pertama).
+        if probe:
+            try:
+                self.i2c.readfrom_mem(DS3231_I2C_ADDR, _TIME_REG, 1)
+            except OSError:
+                raise RuntimeError("DS3231 tidak ditemukan pada bus I2C. Pastikan koneksi benar.")
+
+        # Buffer statis dan method yang sudah di-bind agar pembacaan waktu tidak mengalokasikan heap
+        self._buf = bytearray(7)
+        self._buf19 = bytearray(19) # Register 0x00..0x12: waktu + suhu dalam satu transaksi
+        self._wbuf = bytearray(7) # Buffer tulis untuk set_time()
+        self._tbuf = bytearray(2) # Register suhu 0x11..0x12
+        self._readfrom_mem_into = self.i2c.readfrom_mem_into
+        self._rtc = None # Handle RTC internal, dibuat saat sync_to_rtc() pertama kali dipanggil
+        self._verbose = verbose # Cetak pesan status (print ke UART bersifat blocking)
 
     def __repr__(self):
         try:
@@ -20,118 +70,87 @@ class DS3231:
         except Exception as e:
             return f"DS3231(Error membaca waktu: {e})"
 
-    def _bcd2dec(self, bcd):
-        return (bcd // 16) * 10 + (bcd % 16)
-
-    def _dec2bcd(self, dec):
-        return (dec // 10) * 16 + (dec % 16)
-
     def _read_time_raw(self):
-        return self.i2c.readfrom_mem(DS3231_I2C_ADDR, 0x00, 7)
+        self._readfrom_mem_into(DS3231_I2C_ADDR, _TIME_REG, self._buf)
+        return self._buf
 
     def get_time(self):
-        buf = self._read_time_raw()
+        return self._decode_time(self._read_time_raw())
 
-        second = self._bcd2dec(buf[0] & 0x7F)
-        minute = self._bcd2dec(buf[1] & 0x7F)
-        
-        hour_byte = buf[2]
-        if hour_byte & 0x40:
-            hour = self._bcd2dec(hour_byte & 0x1F)
-            if hour_byte & 0x80:
-                if hour != 12: hour += 12
-            else:
-                if hour == 12: hour = 0
-        else:
-            hour = self._bcd2dec(hour_byte & 0x3F)
+    def _decode_time(self, buf):
+        second = _BCD2DEC[buf[0] & 0x7F]
+        minute = _BCD2DEC[buf[1] & 0x7F]
+        hour = _decode_hour(buf[2])
 
         # Konversi day_of_week dari DS3231 (1=Minggu, 7=Sabtu) ke konvensi 0=Minggu, 6=Sabtu
-        ds_day = self._bcd2dec(buf[3] & 0x07)
-        if ds_day == 1: # DS3231 Minggu adalah indeks 0 kita
-            day_of_week = 0
-        elif ds_day == 7: # DS3231 Sabtu adalah indeks 6 kita
-            day_of_week = 6
-        else: # Senin (2) -> 1, Selasa (3) -> 2, dst.
-            day_of_week = ds_day - 1 
-            
-        date = self._bcd2dec(buf[4] & 0x3F)
-        
-        month_byte = buf[5]
-        century = 0
-        if month_byte & 0x80: century = 100 
-        month = self._bcd2dec(month_byte & 0x1F)
-        
-        year_raw = self._bcd2dec(buf[6])
-        year = 2000 + year_raw + century 
+        day_of_week = _DS_TO_PY[buf[3] & 0x07]
+
+        date = _BCD2DEC[buf[4] & 0x3F]
+        # Bit abad (bit 7 register bulan) diabaikan: rentang yang didukung adalah 2000-2099
+        month = _BCD2DEC[buf[5] & 0x1F]
+        year = 2000 + _BCD2DEC[buf[6]]
 
         return (year, month, date, hour, minute, second, day_of_week, 0) # Hari dalam tahun selalu 0
 
     def set_time(self, year, month, date, hour, minute, second, day_of_week=0):
+        buf = self._wbuf
+        buf[0] = _DEC2BCD[second]
+        buf[1] = _DEC2BCD[minute]
+        buf[2] = _DEC2BCD[hour]
         # Konversi hari_dalam_minggu dari konvensi 0=Minggu, 6=Sabtu ke format DS3231 (1=Minggu, 7=Sabtu)
-        if day_of_week == 0:
-            ds_day_of_week = 1
-        else:
-            ds_day_of_week = day_of_week + 1
-
-        buf = bytearray(7)
-        buf[0] = self._dec2bcd(second)
-        buf[1] = self._dec2bcd(minute)
-        buf[2] = self._dec2bcd(hour)
-        buf[3] = self._dec2bcd(ds_day_of_week) 
-        buf[4] = self._dec2bcd(date)
-        
-        century_bit = 0x00
-        if year >= 2100: 
-            century_bit = 0x80
-            year_to_set = year - 100 
-        else:
-            year_to_set = year
-        
-        buf[5] = self._dec2bcd(month) | century_bit
-        buf[6] = self._dec2bcd(year_to_set % 100) 
+        # Nilai 1..7 dalam BCD sama dengan desimalnya
+        buf[3] = _PY_TO_DS[day_of_week]
+        buf[4] = _DEC2BCD[date]
+        buf[5] = _DEC2BCD[month] # Bit abad tidak dipakai (rentang 2000-2099)
+        buf[6] = _DEC2BCD[year % 100]
+
+        self.i2c.writeto_mem(DS3231_I2C_ADDR, _TIME_REG, buf)
 
-        self.i2c.writeto_mem(DS3231_I2C_ADDR, 0x00, buf)
+    def get_temperature_q2(self):
+        """
+        Membaca suhu sebagai integer dalam satuan 0.25 °C (fixed-point Q2), tanpa alokasi float.
+        Bagi dengan 4 hanya saat perlu ditampilkan, misalnya 101 -> 25.25 °C.
+        """
+        buf = self._tbuf
+        self._readfrom_mem_into(DS3231_I2C_ADDR, _TEMP_REG, buf)
+        return _decode_temperature_q2(buf[0], buf[1])
 
     def get_temperature(self):
-        buf = self.i2c.readfrom_mem(DS3231_I2C_ADDR, 0x11, 2)
-        temp_msb = buf[0]
-        temp_lsb = buf[1] >> 6 
-        temperature = temp_msb + (temp_lsb * 0.25)
-        return temperature
+        return self.get_temperature_q2() * 0.25
+
+    def get_time_and_temperature(self):
+        """
+        Membaca waktu dan suhu sekaligus dalam satu burst read I2C (register 0x00..0x12).
+        DS3231 menaikkan pointer register secara otomatis, sehingga cukup satu transaksi.
+        Mengembalikan tuple (waktu, suhu) dengan format waktu yang sama seperti get_time().
+        """
+        buf = self._buf19
+        self._readfrom_mem_into(DS3231_I2C_ADDR, _TIME_REG, buf)
+        return self._decode_time(buf), _decode_temperature_q2(buf[_TEMP_REG], buf[_TEMP_REG + 1]) * 0.25
 
     def get_unix_time(self):
         """
         Mengambil waktu dari DS3231 dan mengembalikannya sebagai Unix epoch timestamp (detik sejak 2000-01-01 00:00:00 UTC).
         MicroPython mktime dimulai dari 2000-01-01 00:00:00 UTC (bukan 1970).
         """
-        year, month, date, hour, minute, second, day_of_week, _ = self.get_time()
-        # time.mktime() mengharapkan tuple (year, month, mday, hour, minute, second, weekday, yearday)
-        # Kita perlu mengkonversi weekday dari 0=Minggu ke 0=Senin (standar mktime)
-        # DS3231: 0=Minggu, 1=Senin, ..., 6=Sabtu
-        # mktime: 0=Senin, 1=Selasa, ..., 6=Minggu
-        
-        # Konversi day_of_week dari konvensi kita (0=Minggu, ..., 6=Sabtu) ke mktime (0=Senin, ..., 6=Minggu)
-        if day_of_week == 0: # Minggu
-            mktime_weekday = 6 # mktime Minggu
-        else:
-            mktime_weekday = day_of_week - 1 # Senin (1) -> 0, Selasa (2) -> 1, dst.
-            
-        return time.mktime((year, month, date, hour, minute, second, mktime_weekday, 0))
+        buf = self._read_time_raw()
+        # time.mktime() menghitung hasil hanya dari tahun/bulan/tanggal/jam/menit/detik;
+        # field weekday dan yearday diabaikan, jadi register hari (byte 3) tidak perlu didekode.
+        return time.mktime((2000 + _BCD2DEC[buf[6]], _BCD2DEC[buf[5] & 0x1F], _BCD2DEC[buf[4] & 0x3F],
+                            _decode_hour(buf[2]), _BCD2DEC[buf[1] & 0x7F], _BCD2DEC[buf[0] & 0x7F], 0, 0))
 
     def sync_to_rtc(self):
-        rtc = RTC() 
+        if self._rtc is None:
+            self._rtc = RTC()
         ds_time = self.get_time()
         # ds_time: (year, month, mday, hour, minute, second, weekday(0=Minggu), yearday)
         # RTC.datetime(): (year, month, mday, weekday(0=Senin), hour, minute, second, microsecond)
         
         # Konversi weekday dari 0=Minggu ke 0=Senin untuk RTC.datetime()
-        if ds_time[6] == 0: # Jika DS3231 Minggu (indeks 0)
-            rtc_weekday = 6 # Jadi Minggu di RTC.datetime() (indeks 6)
-        else:
-            rtc_weekday = ds_time[6] - 1 # Senin (1) -> 0, Selasa (2) -> 1, dst.
-            
-        rtc.datetime((ds_time[0], ds_time[1], ds_time[2], rtc_weekday, ds_time[3], ds_time[4], ds_time[5], 0))
-        print("Waktu RTC internal ESP32 telah disinkronkan dengan DS3231.")
+        rtc_weekday = _PY_TO_MKTIME[ds_time[6]]
+        self._rtc.datetime((ds_time[0], ds_time[1], ds_time[2], rtc_weekday, ds_time[3], ds_time[4], ds_time[5], 0))
+        if self._verbose:
+            print("Waktu RTC internal ESP32 telah disinkronkan dengan DS3231.")
 
 # --- Contoh Penggunaan Langsung (hanya berjalan jika skrip ini dieksekusi langsung) ---
 if __name__ == "__main__":
@@ -145,7 +164,7 @@ if __name__ == "__main__":
     # time.sleep(1) 
 
     print("\n--- Membaca waktu dari DS3231 ---")
-    rtc_ds3231 = DS3231()
+    rtc_ds3231 = DS3231(verbose=True)
     current_time_ds3231 = rtc_ds3231.get_time()
     year, month, date, hour, minute, second, day_of_week, _ = current_time_ds3231
 
@@ -168,10 +187,7 @@ if __name__ == "__main__":
     current_time_internal = rtc_internal.datetime()
     year_int, month_int, date_int, day_of_week_int, hour_int, minute_int, second_int, _ = current_time_internal
     # Sesuaikan day_of_week_int dari mktime (0=Senin) ke konvensi kita (0=Minggu) untuk tampilan
-    if day_of_week_int == 6: # mktime Minggu
-        display_weekday = 0 # Konvensi kita Minggu
-    else:
-        display_weekday = day_of_week_int + 1 # mktime Senin (0) -> 1, dst.
+    display_weekday = _MKTIME_TO_PY[day_of_week_int]
     print(f"Waktu RTC Internal ESP32: {days[display_weekday]}, {date_int:02d}/{month_int:02d}/{year_int} {hour_int:02d}:{minute_int:02d}:{second_int:02d}")
 
     # --- Contoh penggunaan get_unix_time() ---
@@ -179,11 +195,13 @@ if __name__ == "__main__":
     print(f"Unix Time (dari internal RTC): {time.time()}") # Bandingkan dengan RTC internal
 
     print("\nMemulai loop pembacaan waktu setiap 5 detik (tekan Ctrl+C untuk berhenti)...")
+    # Bind method dan template sekali di luar loop
+    get_time = rtc_ds3231.get_time
+    template = "DS3231: {}, {:02d}/{:02d}/{} {:02d}:{:02d}:{:02d}"
     try:
         while True:
-            current_time_ds3231 = rtc_ds3231.get_time()
-            year, month, date, hour, minute, second, day_of_week, _ = current_time_ds3231
-            print(f"DS3231: {days[day_of_week]}, {date:02d}/{month:02d}/{year} {hour:02d}:{minute:02d}:{second:02d}")
+            year, month, date, hour, minute, second, day_of_week, _ = get_time()
+            print(template.format(days[day_of_week], date, month, year, hour, minute, second))
             time.sleep(5)
     except KeyboardInterrupt:
         print("\nProgram dihentikan oleh pengguna.")
\ No newline at end of file
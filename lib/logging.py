@@ -18,6 +18,17 @@ NOTSET = const(0)
 # Default level jika tidak secara eksplisit diatur
 _DEFAULT_LEVEL = const(WARNING)
 
+# Cetak pesan debug internal RotatingFileHandler (print ke UART bersifat blocking).
+# Dengan nilai 0, compiler MicroPython membuang blok `if _DEBUG:` sepenuhnya.
+_DEBUG = const(0)
+
+# Ukuran buffer tulis yang diminta saat membuka file log. Ini hanya petunjuk: CPython memakainya,
+# tetapi open() VFS MicroPython mengabaikan `buffering`, jadi di ESP32 tidak ada buffer RAM 4 KB
+# dan setiap record tetap ditulis langsung ke file.
+_FILE_BUFFER_SIZE = const(4096)
+# Record dengan level ini ke atas langsung di-flush (di CPython agar tidak tertahan di buffer)
+_FLUSH_LEVEL = const(ERROR)
+
 _level_dict = {
     CRITICAL: "CRITICAL",
     ERROR: "ERROR",
@@ -27,23 +38,66 @@ _level_dict = {
     NOTSET: "NOTSET",
 }
 
+# Referensi langsung ke fungsi waktu agar tidak ada lookup atribut modul time per record
+_time = time.time
+_localtime = time.localtime
+
 _loggers = {} # Kamus global untuk menyimpan instance Logger
+_root_logger = None # Referensi langsung ke root logger, diisi oleh getLogger()
 _default_stream = sys.stderr # Stream default untuk output konsol
 _default_fmt = "%(levelname)s:%(name)s:%(message)s"
 _default_datefmt = "%Y-%m-%d %H:%M:%S" # Format tanggal default untuk MicroPython time.strftime
+_fmt_keys = ("name", "levelname", "message", "asctime") # Atribut LogRecord yang bisa dipakai di fmt
+
+def _compile_fmt(fmt):
+    """
+    Memecah format string menjadi tuple token (teks, is_key) sekali saja,
+    misalnya "%(levelname)s:%(name)s" -> (("levelname", True), (":", False), ("name", True)).
+    Mengembalikan None jika fmt memakai spesifikasi selain %(key)s atau %%.
+    """
+    tokens = []
+    literal = ""
+    i = 0
+    while True:
+        j = fmt.find("%", i)
+        if j < 0:
+            literal += fmt[i:]
+            break
+        literal += fmt[i:j]
+        if fmt[j:j + 2] == "%%":
+            literal += "%"
+            i = j + 2
+            continue
+        if fmt[j:j + 2] != "%(":
+            return None
+        k = fmt.find(")s", j)
+        key = fmt[j + 2:k]
+        if k < 0 or key not in _fmt_keys:
+            return None
+        if literal:
+            tokens.append((literal, False))
+            literal = ""
+        tokens.append((key, True))
+        i = k + 2
+    if literal:
+        tokens.append((literal, False))
+    return tuple(tokens)
 
 class LogRecord:
     """
     Kelas ini merepresentasikan satu peristiwa log. 
     Ini adalah objek data yang membawa informasi log.
     """
+    __slots__ = ("name", "levelno", "levelname", "message", "ct", "asctime", "asctime_fmt")
+
     def set(self, name, level, message):
         self.name = name
         self.levelno = level
         self.levelname = _level_dict[level]
         self.message = message
-        self.ct = time.time() # Waktu saat ini dalam detik sejak epoch
+        self.ct = _time() # Waktu saat ini dalam detik sejak epoch
         self.asctime = None # Akan diisi oleh Formatter
+        self.asctime_fmt = None # datefmt yang dipakai untuk membuat asctime
 
 class Formatter:
     """
@@ -53,10 +107,20 @@ class Formatter:
     def __init__(self, fmt=None, datefmt=None):
         self.fmt = _default_fmt if fmt is None else fmt
         self.datefmt = _default_datefmt if datefmt is None else datefmt
+        # Pilih fungsi format waktu sekali saja, bukan membandingkan datefmt di setiap record
+        self._format_time = self._select_format_time(self.datefmt)
+        # Subclass yang meng-override formatTime() tetap dipanggil; jalur cepat hanya untuk formatTime bawaan
+        self._custom_time = type(self).formatTime is not Formatter.formatTime
+        # Template yang sudah dikompilasi, agar format() tidak perlu membangun dict dan mem-parsing fmt
+        self._tokens = _compile_fmt(self.fmt)
+        self._uses_time = "%(asctime)s" in self.fmt
+        # Cache timestamp terakhir: record dalam detik yang sama memakai string yang sama
+        self._last_ct = None
+        self._last_asctime = None
 
     def usesTime(self):
         """Memeriksa apakah format string membutuhkan timestamp."""
-        return "%(asctime)s" in self.fmt
+        return self._uses_time
 
     # =========================================================
     # 2. Pencatatan waktu berdasarkan WIB (Menggunakan Formatting Manual)
@@ -66,31 +130,53 @@ class Formatter:
         Memformat timestamp dari record secara manual, 
         menggunakan time.localtime() dan string formatting.
         """
-        t = time.localtime(record.ct)
-        # t adalah tuple: (year, month, mday, hour, minute, second, weekday, yearday)
-        year, month, mday, hour, minute, second, _, _ = t
+        if datefmt is self.datefmt:
+            return self._format_time(record)
+        return self._select_format_time(datefmt)(record)
 
+    def _select_format_time(self, datefmt):
+        """Mengembalikan fungsi format waktu yang sesuai untuk datefmt."""
         # Penanganan format yang umum digunakan
-        if datefmt == "%Y-%m-%d %H:%M:%S":
-            return "{:04d}-{:02d}-{:02d} {:02d}:{:02d}:{:02d}".format(
-                year, month, mday, hour, minute, second
-            )
-        elif datefmt == "%H:%M:%S":
-            return "{:02d}:{:02d}:{:02d}".format(
-                hour, minute, second
-            )
-        else:
-            # Fallback jika format tidak secara eksplisit ditangani.
-            # Menggunakan format default '%Y-%m-%d %H:%M:%S'
-            return "{:04d}-{:02d}-{:02d} {:02d}:{:02d}:{:02d}".format(
-                year, month, mday, hour, minute, second
-            )
+        if datefmt == "%H:%M:%S":
+            return self._format_time_hms
+        # '%Y-%m-%d %H:%M:%S', sekaligus fallback jika format tidak secara eksplisit ditangani
+        return self._format_time_full
+
+    def _format_time_full(self, record):
+        # t adalah tuple: (year, month, mday, hour, minute, second, weekday, yearday)
+        year, month, mday, hour, minute, second, _, _ = _localtime(record.ct)
+        return "{:04d}-{:02d}-{:02d} {:02d}:{:02d}:{:02d}".format(
+            year, month, mday, hour, minute, second
+        )
+
+    def _format_time_hms(self, record):
+        _, _, _, hour, minute, second, _, _ = _localtime(record.ct)
+        return "{:02d}:{:02d}:{:02d}".format(
+            hour, minute, second
+        )
 
     def format(self, record):
         """Memformat seluruh record log menjadi string akhir."""
-        if self.usesTime():
-            record.asctime = self.formatTime(self.datefmt, record)
-        
+        if self._uses_time:
+            datefmt = self.datefmt
+            if self._custom_time:
+                # formatTime() milik subclass: tanpa cache, dan tidak dipakai ulang oleh formatter lain
+                record.asctime = self.formatTime(datefmt, record)
+                record.asctime_fmt = None
+            # asctime yang sudah dibuat handler sebelumnya dengan datefmt yang sama dipakai ulang
+            elif record.asctime is None or record.asctime_fmt != datefmt:
+                ct = int(record.ct)
+                if ct != self._last_ct:
+                    self._last_ct = ct
+                    self._last_asctime = self._format_time(record)
+                record.asctime = self._last_asctime
+                record.asctime_fmt = datefmt
+
+        tokens = self._tokens
+        if tokens is not None:
+            return "".join([str(getattr(record, text)) if is_key else text for text, is_key in tokens])
+
+        # Fallback untuk fmt dengan spesifikasi format lain (misalnya %(levelname)-8s)
         record_data = {
             "name": record.name,
             "levelname": record.levelname,
@@ -151,18 +237,31 @@ class StreamHandler(Handler):
     def emit(self, record):
         """Mengeluarkan record ke stream."""
         if record.levelno >= self.level:
-            self.stream.write(self.format(record) + self.terminator)
+            # Dua kali write lebih murah daripada mengalokasikan string gabungan di heap
+            write = self.stream.write
+            write(self.format(record))
+            write(self.terminator)
 
 class FileHandler(StreamHandler):
     """
     Kelas dasar untuk handler yang menulis record log ke file.
     """
     def __init__(self, filename, mode="a", encoding="UTF-8", level=NOTSET):
-        # Membuka file dan meneruskan objek file ke StreamHandler
-        super().__init__(stream=open(filename, mode=mode, encoding=encoding), level=level)
         self.baseFilename = filename # Nama file dasar
         self.mode = mode
         self.encoding = encoding
+        # Membuka file dan meneruskan objek file ke StreamHandler
+        super().__init__(stream=self._open(), level=level)
+
+    def _open(self):
+        """Membuka file log dasar (buffering hanya petunjuk, lihat _FILE_BUFFER_SIZE)."""
+        return open(self.baseFilename, self.mode, buffering=_FILE_BUFFER_SIZE, encoding=self.encoding)
+
+    def emit(self, record):
+        """Mengeluarkan record ke file; record penting langsung di-flush."""
+        super().emit(record)
+        if record.levelno >= _FLUSH_LEVEL:
+            self.stream.flush()
 
     def close(self):
         """Menutup stream file dan memanggil close() dari parent."""
@@ -177,6 +276,10 @@ class FileHandler(StreamHandler):
 class RotatingFileHandler(FileHandler):
     """
     Handler file yang merotasi file log ketika mereka mencapai ukuran tertentu.
+
+    Backup disimpan secara melingkar di <filename>.1 .. <filename>.<backupCount>.
+    Nomor backup terbaru dicatat di <filename>.idx, sehingga setiap rotasi hanya
+    perlu satu rename (bukan menggeser semua file backup).
     """
     def __init__(self, filename, mode="a", maxBytes=0, backupCount=0, encoding="UTF-8", level=NOTSET):
         if maxBytes > 0:
@@ -186,68 +289,107 @@ class RotatingFileHandler(FileHandler):
         super().__init__(filename, mode, encoding, level)
         self.maxBytes = maxBytes # Ukuran maksimum file sebelum rotasi
         self.backupCount = backupCount # Jumlah file backup yang akan disimpan
+        # Ukuran file dilacak di memori; os.stat() hanya dipanggil sekali saat handler dibuat
+        try:
+            self._bytes_written = os.stat(filename)[6]
+        except OSError:
+            self._bytes_written = 0
+        # Terminator tidak berubah, jadi panjang byte-nya cukup dihitung sekali
+        self._terminator_bytes = self.terminator.encode(self.encoding or "utf-8")
+        self._idxFilename = filename + ".idx"
+        self._backup_idx = self._readBackupIndex() # Nomor backup terbaru (0 jika belum ada)
+
+    def _open(self):
+        """
+        Membuka file log dalam mode biner: emit() menulis bytes hasil encoding yang
+        sama dengan yang dihitung untuk _bytes_written, sehingga encode bukan salinan tambahan.
+        """
+        mode = self.mode if "b" in self.mode else self.mode + "b"
+        return open(self.baseFilename, mode, buffering=_FILE_BUFFER_SIZE)
+
+    def _readBackupIndex(self):
+        """Membaca nomor backup terbaru dari file indeks."""
+        try:
+            with open(self._idxFilename) as f:
+                return int(f.read())
+        except (OSError, ValueError):
+            return 0
+
+    def _writeBackupIndex(self):
+        """Menyimpan nomor backup terbaru ke file indeks."""
+        with open(self._idxFilename, "w") as f:
+            f.write(str(self._backup_idx))
 
     def doRotate(self):
         """
         Melakukan proses rotasi file. 
-        Ini akan menutup file saat ini, mengganti nama file-file lama, 
-        dan membuka file log baru.
+        Ini akan menutup file saat ini, mengganti namanya ke slot backup berikutnya
+        (menimpa backup tertua), dan membuka file log baru.
         """
-        print("DEBUG: Memulai rotasi file log...") # Debug print
-        self.close() # Tutup file log aktif saat ini
-
-        if self.backupCount > 0:
-            # Iterasi mundur untuk menggeser file backup: .2 -> .3, .1 -> .2
-            for i in range(self.backupCount - 1, 0, -1):
-                sfn = f"{self.baseFilename}.{i}" # Source file name (misal: my_app.log.1)
-                dfn = f"{self.baseFilename}.{i + 1}" # Destination file name (misal: my_app.log.2)
-                if sfn in os.listdir(): # Jika source file ada
-                    if dfn in os.listdir(): # Jika destination file sudah ada, hapus dulu
-                        os.remove(dfn)
-                        print(f"DEBUG: Menghapus file lama: {dfn}") # Debug print
-                    os.rename(sfn, dfn) # Ganti nama source ke destination
-                    print(f"DEBUG: Mengganti nama {sfn} ke {dfn}") # Debug print
-            
-            # Ganti nama file log aktif (.txt) menjadi file backup pertama (.1)
-            dfn = f"{self.baseFilename}.1"
-            if self.baseFilename in os.listdir(): # Jika file log aktif ada
-                if dfn in os.listdir(): # Jika .1 sudah ada, hapus dulu
-                    os.remove(dfn)
-                    print(f"DEBUG: Menghapus file lama: {dfn}") # Debug print
-                os.rename(self.baseFilename, dfn)
-                print(f"DEBUG: Mengganti nama {self.baseFilename} ke {dfn}") # Debug print
-        
-        # Buka kembali file log dasar untuk log baru
-        self.stream = open(self.baseFilename, self.mode, encoding=self.encoding)
-        print("DEBUG: Rotasi file log selesai. File baru dibuka.") # Debug print
+        if _DEBUG: print("DEBUG: Memulai rotasi file log...") # Debug print
+        self.close() # Flush dan tutup file log aktif saat ini (satu kali)
+        self.stream = None # Lepas referensi ke file lama agar GC bisa segera membebaskannya
 
-    def shouldRotate(self, record):
+        try:
+            if self.backupCount > 0:
+                # Slot berikutnya secara melingkar: 1, 2, ..., backupCount, 1, ...
+                idx = self._backup_idx % self.backupCount + 1
+                # Ganti nama file log aktif ke slot tersebut (misal: my_app.log.2)
+                self._replace(self.baseFilename, f"{self.baseFilename}.{idx}")
+                self._backup_idx = idx
+                self._writeBackupIndex()
+            self._bytes_written = 0
+        finally:
+            # Buka kembali file log dasar untuk log baru, juga jika rename gagal
+            self.stream = self._open()
+        if _DEBUG: print("DEBUG: Rotasi file log selesai. File baru dibuka.") # Debug print
+
+    def _replace(self, sfn, dfn):
+        """
+        Mengganti nama sfn menjadi dfn, menghapus dfn lama terlebih dahulu.
+        File yang tidak ada cukup ditangani lewat OSError, tanpa memindai os.listdir().
+        """
+        try:
+            os.stat(sfn) # Jika source file tidak ada, dfn lama tidak boleh dihapus
+        except OSError:
+            return
+        try:
+            os.remove(dfn) # Jika destination file sudah ada, hapus dulu
+            if _DEBUG: print(f"DEBUG: Menghapus file lama: {dfn}") # Debug print
+        except OSError:
+            pass
+        os.rename(sfn, dfn)
+        if _DEBUG: print(f"DEBUG: Mengganti nama {sfn} ke {dfn}") # Debug print
+
+    def shouldRotate(self, record, nbytes=0):
         """
-        Menentukan apakah rotasi harus terjadi berdasarkan ukuran file.
+        Menentukan apakah rotasi harus terjadi sebelum menulis nbytes berikutnya,
+        berdasarkan penghitung byte di memori (tanpa os.stat() per record).
+        File yang masih kosong tidak dirotasi meskipun satu record melebihi maxBytes.
         """
-        if self.maxBytes > 0:
-            # PENTING: Lakukan flush() sebelum mengecek ukuran file untuk mendapatkan ukuran yang akurat
-            if hasattr(self.stream, 'flush'): 
-                self.stream.flush() # Pastikan semua data di buffer ditulis ke disk
-
-            if self.baseFilename in os.listdir():
-                try:
-                    current_size = os.stat(self.baseFilename)[6] # Dapatkan ukuran file dalam byte
-                    print(f"DEBUG: Mengecek rotasi. Ukuran saat ini: {current_size} bytes, Ukuran max: {self.maxBytes} bytes.") # Debug print
-                    if current_size >= self.maxBytes:
-                        print("DEBUG: Kondisi rotasi terpenuhi!") # Debug print
-                        return True
-                except OSError as e:
-                    print(f"DEBUG: OSError saat cek ukuran file: {e}. Memaksa rotasi.") # Debug print
-                    return True # Force rotation if stat fails
+        if self.maxBytes > 0 and self._bytes_written > 0:
+            if _DEBUG: print(f"DEBUG: Mengecek rotasi. Ukuran saat ini: {self._bytes_written} bytes, Ukuran max: {self.maxBytes} bytes.") # Debug print
+            if self._bytes_written + nbytes >= self.maxBytes:
+                if _DEBUG: print("DEBUG: Kondisi rotasi terpenuhi!") # Debug print
+                return True
         return False
 
     def emit(self, record):
         """Mengeluarkan record, memicu rotasi jika diperlukan."""
         try:
-            if self.shouldRotate(record):
-                self.doRotate() # Lakukan rotasi jika diperlukan
-            super().emit(record) # Kemudian keluarkan record menggunakan metode parent (FileHandler)
+            if record.levelno >= self.level:
+                # Encode sekali: bytes ini yang ditulis, dan panjangnya dalam satuan yang sama dengan os.stat()/maxBytes
+                data = self.format(record).encode(self.encoding or "utf-8")
+                terminator = self._terminator_bytes
+                nbytes = len(data) + len(terminator)
+                if self.shouldRotate(record, nbytes):
+                    self.doRotate() # Rotasi sebelum record ini membuat file melewati maxBytes
+                write = self.stream.write
+                write(data)
+                write(terminator)
+                self._bytes_written += nbytes
+                if record.levelno >= _FLUSH_LEVEL:
+                    self.stream.flush()
         except Exception as e:
             # Fallback ke sys.stderr jika ada masalah saat logging ke file
             _default_stream.write(f"ERROR: Logging to file failed: {e}\n")
@@ -262,7 +404,7 @@ class Logger:
     def __init__(self, name, level=NOTSET):
         self.name = name
         self.level = level
-        self.handlers = [] # Daftar handler yang terhubung ke logger ini
+        self.handlers = [] # Daftar handler yang terhubung ke logger ini (setter juga membangun _handlers)
         self.record = LogRecord() # Objek LogRecord yang digunakan kembali untuk mengurangi alokasi memori
 
     def setLevel(self, level):
@@ -280,7 +422,8 @@ class Logger:
 
     def log(self, level, msg, *args):
         """Mencatat pesan pada level yang ditentukan."""
-        if self.isEnabledFor(level):
+        # Sama dengan isEnabledFor(level), tanpa dua pemanggilan method per record
+        if level >= (self.level or _DEFAULT_LEVEL):
             # Format pesan dengan argumen jika disediakan
             if args:
                 if len(args) == 1 and isinstance(args[0], dict):
@@ -288,29 +431,34 @@ class Logger:
                 else:
                     msg = msg % args
             
-            self.record.set(self.name, level, msg)
+            record = self.record
+            record.set(self.name, level, msg)
             
             # Jika tidak ada handler yang disetel pada logger ini, gunakan handler dari root logger
-            handlers_to_use = self.handlers if self.handlers else getLogger().handlers
-            
-            for h in handlers_to_use:
-                h.emit(self.record)
+            for h in self._handlers or (_root_logger or getLogger())._handlers:
+                h.emit(record)
 
     # Metode pintas untuk setiap level log
+    # Level dicek lebih dulu agar pemanggilan pada level yang nonaktif tidak meneruskan args ke log()
     def debug(self, msg, *args):
-        self.log(DEBUG, msg, *args)
+        if DEBUG >= (self.level or _DEFAULT_LEVEL):
+            self.log(DEBUG, msg, *args)
 
     def info(self, msg, *args):
-        self.log(INFO, msg, *args)
+        if INFO >= (self.level or _DEFAULT_LEVEL):
+            self.log(INFO, msg, *args)
 
     def warning(self, msg, *args):
-        self.log(WARNING, msg, *args)
+        if WARNING >= (self.level or _DEFAULT_LEVEL):
+            self.log(WARNING, msg, *args)
 
     def error(self, msg, *args):
-        self.log(ERROR, msg, *args)
+        if ERROR >= (self.level or _DEFAULT_LEVEL):
+            self.log(ERROR, msg, *args)
 
     def critical(self, msg, *args):
-        self.log(CRITICAL, msg, *args)
+        if CRITICAL >= (self.level or _DEFAULT_LEVEL):
+            self.log(CRITICAL, msg, *args)
 
     def exception(self, msg, *args, exc_info=True):
         """Mencatat pesan ERROR dengan informasi pengecualian (traceback)."""
@@ -327,16 +475,33 @@ class Logger:
             sys.print_exception(tb, buf)
             self.log(ERROR, "Traceback:\n" + buf.getvalue())
 
+    @property
+    def handlers(self):
+        """
+        Daftar handler yang terhubung ke logger ini.
+        log() mengiterasi salinan tuple-nya (_handlers), yang dibangun ulang oleh addHandler(),
+        removeHandler(), dan penugasan `logger.handlers = [...]`. Jika list ini diubah langsung
+        (append/remove/clear), panggil addHandler()/removeHandler() atau tugaskan ulang list-nya.
+        """
+        return self._handler_list
+
+    @handlers.setter
+    def handlers(self, handlers):
+        self._handler_list = handlers
+        self._handlers = tuple(handlers)
+
     def addHandler(self, handler):
         """Menambahkan handler yang ditentukan ke logger ini."""
-        self.handlers.append(handler)
+        self._handler_list.append(handler)
+        self._handlers = tuple(self._handler_list)
 
     def removeHandler(self, handler):
         """Menghapus handler yang ditentukan dari logger ini."""
         try:
-            self.handlers.remove(handler)
+            self._handler_list.remove(handler)
         except ValueError:
-            pass 
+            pass
+        self._handlers = tuple(self._handler_list)
 
     def hasHandlers(self):
         """Memeriksa apakah logger ini memiliki handler."""
@@ -346,17 +511,19 @@ class Logger:
 
 def getLogger(name=None):
     """Mengembalikan logger dengan nama yang ditentukan, membuatnya jika perlu."""
-    if name is None or name == "root":
+    global _root_logger
+    if name is None:
         name = "root"
-        if name not in _loggers:
-            _loggers[name] = Logger(name)
+    # Satu kali lookup dict untuk jalur umum (logger sudah ada)
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = Logger(name)
+        _loggers[name] = logger
+        if name == "root":
+            _root_logger = logger
             # Ketika root logger pertama kali didapatkan, basicConfig secara otomatis dipanggil
-            basicConfig() 
-        return _loggers[name]
-    
-    if name not in _loggers:
-        _loggers[name] = Logger(name)
-    return _loggers[name]
+            basicConfig()
+    return logger
 
 def basicConfig(
     filename=None,
@@ -369,7 +536,7 @@ def basicConfig(
     force=False,
 ):
     """Mengkonfigurasi root logger."""
-    logger = getLogger("root") # Memastikan root logger ada
+    logger = _root_logger or getLogger("root") # Memastikan root logger ada
 
     if force or not logger.hasHandlers():
         for h in logger.handlers:
@@ -392,6 +559,8 @@ def basicConfig(
 
 def shutdown():
     """Menutup semua handler aktif dan menghapus semua logger."""
+    global _root_logger
+    _root_logger = None
     for logger_name in list(_loggers.keys()): 
         logger = _loggers[logger_name]
         for h in logger.handlers:
@@ -403,13 +572,14 @@ if hasattr(sys, "atexit"):
     sys.atexit(shutdown)
 
 # Fungsi pintas global yang langsung ke root logger
-log = getLogger().log
-debug = getLogger().debug
-info = getLogger().info
-warning = getLogger().warning
-error = getLogger().error
-critical = getLogger().critical
-exception = getLogger().exception
+_root_logger = getLogger()
+log = _root_logger.log
+debug = _root_logger.debug
+info = _root_logger.info
+warning = _root_logger.warning
+error = _root_logger.error
+critical = _root_logger.critical
+exception = _root_logger.exception
 
 def getLevelName(level):
     """Mengembalikan nama string untuk level log numerik."""
@@ -433,14 +603,22 @@ if __name__ == "__main__":
     # --- Hapus file log lama saat startup untuk demo bersih ---
     # Ini memastikan setiap demo dimulai dari nol.
     print(f"DEBUG: Membersihkan file log lama...") # Debug print
-    if LOG_FILE in os.listdir(): 
+    try:
         os.remove(LOG_FILE)
         print(f"File log utama '{LOG_FILE}' dihapus.")
+    except OSError:
+        pass
     for i in range(1, BACKUP_COUNT + 2): # Hapus hingga backupCount + 1
         backup_file = f"{LOG_FILE}.{i}"
-        if backup_file in os.listdir():
+        try:
             os.remove(backup_file)
             print(f"File backup lama '{backup_file}' dihapus.")
+        except OSError:
+            pass
+    try:
+        os.remove(f"{LOG_FILE}.idx") # File indeks rotasi
+    except OSError:
+        pass
     print(f"DEBUG: Pembersihan file log selesai.") # Debug print
 
     # --- Konfigurasi Root Logger ---
@@ -477,17 +655,18 @@ if __name__ == "__main__":
     my_app_logger = getLogger("MyAppDemo")
     
     print("\n--- Mulai Mencatat Log ---")
+    # Argumen gaya %-format (bukan f-string): pesan hanya diformat bila level-nya aktif
     for i in range(1, 101): # Loop menjadi 100 kali
-        my_app_logger.debug(f"Pesan Debug ke-{i}. Ini mungkin tidak terlihat di konsol.")
-        my_app_logger.info(f"Pesan Info ke-{i}. Ukuran file log akan bertambah.")
+        my_app_logger.debug("Pesan Debug ke-%d. Ini mungkin tidak terlihat di konsol.", i)
+        my_app_logger.info("Pesan Info ke-%d. Ukuran file log akan bertambah.", i)
         if i % 3 == 0:
-            my_app_logger.warning(f"Pesan Peringatan ke-{i}. Perhatikan rotasi file!")
+            my_app_logger.warning("Pesan Peringatan ke-%d. Perhatikan rotasi file!", i)
         if i % 5 == 0:
-            my_app_logger.error(f"Pesan Error ke-{i}. Simulating an issue.")
+            my_app_logger.error("Pesan Error ke-%d. Simulating an issue.", i)
             try:
                 result = 10 / 0 # Sengaja memicu error
             except Exception as e:
-                my_app_logger.exception(f"Exception di loop ke-{i}:") # Akan mencetak traceback
+                my_app_logger.exception("Exception di loop ke-%d:", i) # Akan mencetak traceback
         
         time.sleep(0.05) # Jeda singkat untuk memungkinkan penulisan ke file
 
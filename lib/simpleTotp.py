@@ -4,6 +4,21 @@ from ds3231 import DS3231 # Mengimpor kelas DS3231 yang sudah dimodifikasi
 from machine import Pin, I2C # Diperlukan untuk inisialisasi I2C jika diuji langsung
 import time, logging
 
+def _build_kode_ketuk(value):
+    # Ubah integer ke string biner 6 bit dengan padding nol di depan
+    padded_binary_string = '{:06b}'.format(value)
+
+    # Ganti '0' dengan '.' dan '1' dengan '-', lalu tambahkan ketukan penutup '.'
+    # (MicroPython tidak memiliki str.translate; replace() berjalan di C tanpa string perantara per karakter)
+    return padded_binary_string.replace('0', '.').replace('1', '-') + '.'
+
+# Jeda terpanjang yang aman untuk time.ticks_add(): setengah periode ticks_ms (2^30) dikurangi 1.
+# Time step yang lebih panjang (misalnya mingguan) dicicil: DS3231 dibaca ulang setiap ~6,2 hari.
+_MAX_REFRESH_MS = (1 << 29) - 1
+
+# Hanya ada 64 kemungkinan sandi, jadi semua kode ketukan dihitung sekali saat modul dimuat
+_KODE_TABLE = tuple(_build_kode_ketuk(i) for i in range(64))
+
 class SimpleTOTP:
     def __init__(self, rtc_ds3231, secret_key, time_step_seconds=60):
         """
@@ -24,13 +39,22 @@ class SimpleTOTP:
         self.secret_key = secret_key
         self.time_step_seconds = time_step_seconds
         self.max_password_value = 63 # 2^6 - 1
+        self._mask = self.max_password_value # 64 adalah pangkat 2, jadi modulo 64 sama dengan & 63
         self.password = 0
         self.kode_ketuk = "......"
+        self._last_counter = None # Counter waktu terakhir yang sudah dihitung sandinya
+        self._next_refresh_ms = 0 # ticks_ms() saat DS3231 perlu dibaca lagi (batas interval berikutnya)
 
     def generate_password(self):
         """
         Menghasilkan sandi TOTP berupa integer 0-63.
+        DS3231 hanya dibaca saat batas time step berikutnya tercapai; di antaranya sandi
+        tidak mungkin berubah sehingga pembacaan I2C dilewati.
         """
+        now_ms = time.ticks_ms()
+        if self._last_counter is not None and time.ticks_diff(now_ms, self._next_refresh_ms) < 0:
+            return # Batas interval berikutnya belum tercapai
+
         # Dapatkan Unix epoch time dari DS3231
         current_unix_time = self.rtc_ds3231.get_unix_time()
 
@@ -38,13 +62,31 @@ class SimpleTOTP:
         # Ini adalah jumlah interval waktu yang telah berlalu sejak epoch
         time_counter = current_unix_time // self.time_step_seconds
 
+        # Jadwalkan pembacaan berikutnya di batas interval. Resolusi DS3231 adalah 1 detik,
+        # jadi pergantian sandi bisa terlambat kurang dari 1 detik.
+        seconds_left = self.time_step_seconds - current_unix_time % self.time_step_seconds
+        self._next_refresh_ms = time.ticks_add(now_ms, min(seconds_left * 1000, _MAX_REFRESH_MS))
+
+        if time_counter == self._last_counter:
+            return # Masih dalam interval yang sama, sandi tidak berubah
+        self._last_counter = time_counter
+
         # Algoritma sederhana untuk TOTP (modifikasi)
         # Kita akan menggunakan XOR dengan secret_key dan kemudian modulo 64
         # untuk mendapatkan nilai antara 0 dan 63.
         # Penggunaan XOR sangat sensitif terhadap perubahan bit, yang membantu dalam randomness.
-        self.password = (time_counter ^ self.secret_key) % (self.max_password_value + 1)
-        self.kode_ketuk = self.integer_to_custom_binary_string(self.password)
+        self.password = (time_counter ^ self.secret_key) & self._mask
+        self.kode_ketuk = _KODE_TABLE[self.password] # password selalu 0-63 karena modulo 64
         
+    def ms_until_next_step(self):
+        """
+        Mengembalikan sisa waktu (ms) hingga batas time step berikutnya, yaitu saat
+        generate_password() akan membaca DS3231 lagi. Berguna untuk tidur tepat hingga sandi berganti.
+        Untuk time step yang sangat panjang, nilainya dibatasi _MAX_REFRESH_MS (~6,2 hari);
+        setelah itu DS3231 dibaca ulang dan sisa waktu dihitung kembali.
+        """
+        return max(0, time.ticks_diff(self._next_refresh_ms, time.ticks_ms()))
+
     def integer_to_custom_binary_string(self, value):
         """
         Mengubah nilai integer (0-63) menjadi representasi biner 6-bit
@@ -61,23 +103,7 @@ class SimpleTOTP:
         if not (0 <= value <= 63):
             raise ValueError("Nilai harus dalam rentang 0 hingga 63.")
 
-        # Ubah integer ke string biner tanpa '0b'
-        binary_string_raw = bin(value)[2:]
-
-        # Lakukan padding nol di depan secara manual hingga panjang 6 bit
-        # Jika panjang kurang dari 6, tambahkan '0' di depan
-        padded_binary_string = '0' * (6 - len(binary_string_raw)) + binary_string_raw
-
-        # Ganti '0' dengan '.' dan '1' dengan '-'
-        custom_binary_string = ""
-        for bit in padded_binary_string: # Gunakan string yang sudah di-padding
-            if bit == '0':
-                custom_binary_string += '.'
-            elif bit == '1':
-                custom_binary_string += '-'
-        custom_binary_string += '.'
-        
-        return custom_binary_string    
+        return _KODE_TABLE[value]
 
 # --- Contoh Penggunaan Langsung (hanya berjalan jika skrip ini dieksekusi langsung) ---
 if __name__ == "__main__":
@@ -108,7 +134,7 @@ if __name__ == "__main__":
     totp_generator = SimpleTOTP(rtc, MY_SECRET_KEY, TOTP_TIME_STEP)
     print(f"\nSimpleTOTP diinisialisasi dengan kunci rahasia: {MY_SECRET_KEY} dan time step: {TOTP_TIME_STEP}s")
 
-    print("\n--- Generating TOTP Passwords setiap 5 detik (Ctrl+C untuk berhenti) ---")
+    print("\n--- Generating TOTP Passwords setiap pergantian time step (Ctrl+C untuk berhenti) ---")
     last_password = -1
     while True:
         totp_generator.generate_password()
@@ -119,5 +145,6 @@ if __name__ == "__main__":
             last_password = totp_generator.password
         else:
             print(f"Sandi Saat Ini: {totp_generator.kode_ketuk}")
-            
-        time.sleep(5)
\ No newline at end of file
+
+        # Tidur hingga batas time step berikutnya, bukan polling tetap setiap 5 detik
+        time.sleep_ms(totp_generator.ms_until_next_step())
\ No newline at end of file
@@ -1,15 +1,136 @@
 # sound_tap_detector_v3.py - Deteksi Ketukan Pendek/Panjang & Pola Biner (QYF-0037V3)
 
-from machine import Pin
-import time
+from machine import Pin, Timer
+import micropython
+from micropython import const
+import struct
+# Diikat langsung ke nama modul agar ISR tidak perlu LOAD_GLOBAL time + LOAD_ATTR di setiap pembacaan jam
+from time import ticks_ms as _ticks_ms, ticks_diff as _ticks_diff, ticks_add as _ticks_add
+try:
+    import asyncio
+except ImportError: # Firmware MicroPython lama hanya menyediakan uasyncio
+    import uasyncio as asyncio
+
+# Buffer cincin untuk catatan kejadian dari ISR; dicetak oleh loop utama lewat drain_log()
+_LOG_SLOTS = const(64)    # Harus pangkat 2 (indeks dibungkus dengan & (_LOG_SLOTS - 1))
+_LOG_REC_SIZE = const(4)  # tap_count:u8, kind:u8, time_diff:u16
+_LOG_FMT = "<BBH"
+
+# Jenis kejadian di catatan log
+_EV_FIRST = const(0)  # Ketukan pertama dalam urutan
+_EV_SHORT = const(1)  # Jeda pendek ('.')
+_EV_LONG = const(2)   # Jeda panjang ('-'); harus _EV_SHORT + 1
+_EV_RESET = const(3)  # Ketukan tambahan setelah urutan lengkap, urutan direset
+_EV_TIMEOUT = const(4) # Timer timeout berbunyi di tengah urutan, urutan direset
+
+# Template pesan yang dicetak berulang (format %, bukan f-string yang di-parse di setiap pemanggilan)
+_FMT_TAP = "Ketukan #%d (%s, jeda: %dms). Urutan biner: %s"
+_FMT_LAST_TAP = "Ketukan terakhir (%s, jeda: %dms). Urutan biner: %s"
+_FMT_TIMEOUT = "Timeout! Tidak ada ketukan selama %dms. Urutan direset."
+_FMT_BAD_LENGTH = "Error: Panjang string biner (%d bit) tidak sesuai (seharusnya %d bit)."
+
+# ID machine.Timer yang sedang dipakai detektor aktif (dilepas oleh deactivate())
+_timers_in_use = set()
+
+def _bits_to_str(bits, nbits):
+    """Mengubah akumulator bit menjadi string biner kustom (misal: ".-..-.")."""
+    return "".join(["-" if (bits >> (nbits - 1 - i)) & 1 else "." for i in range(nbits)])
+
+def _make_tap_handler(det, debounce_ms, short_max_ms, last_index, timeout_ms):
+    """
+    Membangun fungsi callback interupsi dan fungsi-fungsi state untuk satu detektor.
+    Parameter yang tetap sejak inisialisasi (debounce, batas jeda pendek, jumlah ketukan, timeout)
+    diikat sebagai konstanta closure, sehingga ISR tidak perlu membaca atributnya dari `det`.
+    `det._tap_event` dan `det._timeout_timer` harus sudah dibuat sebelum fungsi ini dipanggil.
+
+    :return: Tuple (handler ISR, state ketukan pertama).
+    """
+    def st_first(current_time):
+        """State: ketukan pertama dari urutan baru (selalu pendek, tidak menghasilkan bit)."""
+        det._current_tap_count = 1
+        det._log_event(1, _EV_FIRST, 0)
+        det._state = st_tap if expected_bits > 0 else st_done
+
+    @micropython.native
+    def st_tap(current_time):
+        """State: ketukan ke-2 hingga terakhir; jeda dari ketukan sebelumnya menentukan satu bit."""
+        tap_count = det._current_tap_count + 1
+        det._current_tap_count = tap_count
+        # Hitung jeda dari ketukan sebelumnya dalam urutan: jeda pendek = 0 ('.'), panjang = 1 ('-')
+        time_diff = _ticks_diff(current_time, det._last_sequence_tap_time)
+        bit = 1 if time_diff > short_max_ms else 0
+        det._bits = (det._bits << 1) | bit
+        nbits = det._nbits + 1
+        det._nbits = nbits
+        det._log_event(tap_count, _EV_SHORT + bit, time_diff)
+        if nbits == expected_bits:
+            # Ini adalah ketukan fisik terakhir (ke-7), yang hanya menentukan jeda untuk bit ke-6.
+            det._full_sequence_ready = True
+            det._state = st_done
+
+    def st_done(current_time):
+        """State: semua ketukan sudah diterima; ketukan tambahan memulai urutan baru."""
+        if det._full_sequence_ready: # Kalau sudah selesai, dan ada ketukan lagi, reset saja
+            det._log_event(0, _EV_RESET, 0)
+            det._reset_state()
+            st_first(current_time)
+        else:
+            # Urutan sudah dibaca tetapi belum direset: ketukan tambahan hanya dihitung
+            det._current_tap_count += 1
+
+    # Jalur panas ISR dikompilasi ke kode mesin; viper tidak dipakai karena fungsi ini mengakses atribut objek
+    @micropython.native
+    def handle_tap_interrupt(pin_obj):
+        """
+        Fungsi callback interupsi internal.
+        Memproses setiap deteksi ketukan untuk membangun urutan biner.
+        """
+        current_time = _ticks_ms()
+        # Jalur paling sering (pantulan/derau): satu ticks_diff dan cek tanda, tanpa membaca atribut lain
+        if _ticks_diff(current_time, det._next_valid_time) <= 0:
+            return
+
+        # --- Logika Deteksi Pola Ketukan (ketukan valid setelah debounce) ---
+        # State disimpan sebagai closure biasa, sehingga pergantian state tidak mengalokasikan objek baru
+        det._state(current_time)
+
+        det._last_sequence_tap_time = current_time # Perbarui waktu ketukan terakhir untuk perhitungan jeda dan timeout
+        det._next_valid_time = _ticks_add(current_time, debounce_ms) # Batas debounce berikutnya
+        # Jadwalkan ulang timer one-shot: berbunyi jika tidak ada ketukan lagi selama timeout_ms
+        timeout_timer.init(period=timeout_ms, mode=Timer.ONE_SHOT, callback=on_timeout)
+        tap_event.set() # Bangunkan task yang menunggu di wait_for_activity()
+
+    def on_timeout(timer):
+        """Callback timer: mereset urutan yang terhenti di tengah jalan, tanpa polling dari loop utama."""
+        if det._current_tap_count == 0 or det._full_sequence_ready:
+            return
+        # Ketukan yang masuk tepat sebelum callback ini dijalankan sudah menjadwalkan ulang timer
+        if _ticks_diff(_ticks_ms(), det._last_sequence_tap_time) < timeout_ms:
+            return
+        det._log_event(0, _EV_TIMEOUT, 0)
+        det._reset_state()
+        tap_event.set()
+
+    expected_bits = last_index - 1
+    tap_event = det._tap_event
+    timeout_timer = det._timeout_timer
+    return handle_tap_interrupt, st_first
 
 class SoundTapDetector:
+    __slots__ = ("pin_number", "pin", "_debounce_time_ms", "trigger_type",
+                 "_short_tap_max_delay_ms", "long_tap_min_delay_ms", "_total_taps_to_expect", "_sequence_timeout_ms",
+                 "_expected_bits", "_last_tap_index", "_last_seen_count", "_next_valid_time",
+                 "_bits", "_nbits", "_last_sequence_tap_time", "_full_sequence_ready", "_current_tap_count",
+                 "_tap_event", "_timeout_timer", "_timer_id", "_handle_tap_interrupt", "_st_first", "_state",
+                 "_log_buf", "_log_head", "_log_tail", "_log_bits", "_log_nbits")
+
     def __init__(self, pin_number=19, debounce_time_ms=250, 
                  short_tap_max_delay_ms=500, # Jeda MAX untuk 'pendek' (0)
                  long_tap_min_delay_ms=501,  # Jeda MIN untuk 'panjang' (1)
                  total_taps_to_expect=7,     # Jumlah total ketukan fisik yang ditunggu
                  trigger_type=Pin.IRQ_FALLING,
-                 sequence_timeout_ms=2000):  # DEFAULT: Reset setelah 2 detik tidak ada ketukan
+                 sequence_timeout_ms=2000,   # DEFAULT: Reset setelah 2 detik tidak ada ketukan
+                 timer_id=0):                # Timer perangkat keras untuk timeout urutan
         """
         Menginisialisasi detektor ketukan dengan kemampuan mendeteksi pola pendek/panjang
         dan mengonversinya menjadi representasi biner, serta fitur timeout.
@@ -24,121 +145,174 @@ class SoundTapDetector:
         :param trigger_type: Tipe pemicu interupsi.
         :param sequence_timeout_ms: Waktu dalam milidetik setelah ketukan terakhir,
                                     jika tidak ada ketukan baru, urutan akan direset.
+        :param timer_id: ID timer perangkat keras (machine.Timer) yang dipakai untuk timeout urutan.
+                         ESP32 tidak mendukung timer virtual (-1), jadi gunakan 0-3.
+                         Setiap detektor aktif membutuhkan timer sendiri: detektor kedua harus memakai
+                         timer_id lain, jika tidak akan muncul ValueError. Timer dilepas oleh deactivate().
         """
         self.pin_number = pin_number
         self.pin = Pin(pin_number, Pin.IN, Pin.PULL_UP)
-        self.debounce_time_ms = debounce_time_ms
+        self._debounce_time_ms = debounce_time_ms
         self.trigger_type = trigger_type
         
-        self.short_tap_max_delay_ms = short_tap_max_delay_ms
+        self._short_tap_max_delay_ms = short_tap_max_delay_ms
         self.long_tap_min_delay_ms = long_tap_min_delay_ms
-        self.total_taps_to_expect = total_taps_to_expect
-        self.sequence_timeout_ms = sequence_timeout_ms
+        self._total_taps_to_expect = total_taps_to_expect
+        self._expected_bits = total_taps_to_expect - 1 # Jumlah bit dalam urutan lengkap (7-1 = 6 bit)
+        self._last_tap_index = total_taps_to_expect    # Nomor ketukan fisik terakhir dalam urutan
+        self._sequence_timeout_ms = sequence_timeout_ms
 
-        self._tap_detected_flag = False
-        self._last_tap_time = 0
+        self._last_seen_count = 0 # Hitungan ketukan terakhir yang dilihat is_tap_detected() (bukan flag dari ISR)
+        self._next_valid_time = _ticks_add(0, debounce_time_ms) # Ketukan sebelum waktu ini dianggap pantulan
         
-        self._current_binary_sequence = "" # Menyimpan representasi biner (.,-)
+        self._bits = 0                     # Akumulator bit urutan ('.' = 0, '-' = 1), tanpa alokasi string di ISR
+        self._nbits = 0                    # Jumlah bit yang sudah masuk ke akumulator
         self._last_sequence_tap_time = 0   # Waktu ketukan terakhir yang valid dalam urutan
         self._full_sequence_ready = False  
         self._current_tap_count = 0        # Menghitung ketukan fisik yang terdeteksi dalam urutan
 
+        # Sinyal dari ISR ke task asyncio: diset pada setiap ketukan valid (termasuk yang melengkapi urutan)
+        self._tap_event = asyncio.ThreadSafeFlag()
+        # Timer one-shot yang dijadwalkan ulang pada setiap ketukan; menggantikan polling check_for_timeout()
+        # Dua detektor pada timer yang sama akan saling menjadwalkan ulang timeout, jadi ditolak.
+        if timer_id in _timers_in_use:
+            raise ValueError("Timer %d sudah dipakai SoundTapDetector lain; gunakan timer_id berbeda." % timer_id)
+        self._timeout_timer = Timer(timer_id)
+        self._timer_id = timer_id
+        _timers_in_use.add(timer_id)
+
+        # ISR dan state-nya dibangun sekali; debounce, batas jeda pendek, jumlah ketukan, dan timeout
+        # menjadi konstanta closure, karena itu properti publiknya hanya-baca
+        self._handle_tap_interrupt, self._st_first = _make_tap_handler(
+            self, debounce_time_ms, short_tap_max_delay_ms, total_taps_to_expect, sequence_timeout_ms)
+        self._state = self._st_first # State ISR untuk ketukan berikutnya
+
+        # Buffer cincin produsen tunggal (ISR) / konsumen tunggal (drain_log)
+        self._log_buf = bytearray(_LOG_SLOTS * _LOG_REC_SIZE)
+        self._log_head = 0 # Hanya diubah oleh ISR
+        self._log_tail = 0 # Hanya diubah oleh drain_log()
+        self._log_bits = 0 # Salinan urutan di sisi loop utama, untuk ditampilkan
+        self._log_nbits = 0
+
         self.pin.irq(trigger=self.trigger_type, handler=self._handle_tap_interrupt)
         
         print(f"SoundTapDetector diinisialisasi pada GPIO{self.pin_number}.")
         print(f"Debounce: {debounce_time_ms}ms, Trigger: {trigger_type}.")
         print(f"Jeda Pendek (0): <= {short_tap_max_delay_ms}ms.")
         print(f"Jeda Panjang (1): >= {long_tap_min_delay_ms}ms.")
-        print(f"Mencari {total_taps_to_expect} ketukan fisik (hasil biner 6-bit).")
+        print(f"Mencari {total_taps_to_expect} ketukan fisik (hasil biner {self._expected_bits}-bit).")
         print(f"Urutan akan direset jika tidak ada ketukan selama {sequence_timeout_ms}ms.")
         print("Pastikan potensiometer sensor diatur agar LED DO mati saat diam.")
 
-    def _handle_tap_interrupt(self, pin_obj):
+    # Parameter berikut sudah diikat ke closure ISR saat inisialisasi, sehingga hanya-baca.
+    # Buat SoundTapDetector baru untuk memakai nilai lain.
+    @property
+    def debounce_time_ms(self):
+        """Waktu debounce dalam milidetik."""
+        return self._debounce_time_ms
+
+    @property
+    def short_tap_max_delay_ms(self):
+        """Jeda maksimum (ms) antar ketukan untuk dianggap pendek ('.')."""
+        return self._short_tap_max_delay_ms
+
+    @property
+    def total_taps_to_expect(self):
+        """Jumlah total ketukan fisik dalam satu urutan."""
+        return self._total_taps_to_expect
+
+    @property
+    def sequence_timeout_ms(self):
+        """Waktu (ms) tanpa ketukan sebelum urutan direset."""
+        return self._sequence_timeout_ms
+
+    def _log_event(self, tap_count, kind, time_diff):
         """
-        Fungsi callback interupsi internal.
-        Memproses setiap deteksi ketukan untuk membangun urutan biner.
+        Menyimpan satu catatan kejadian ke buffer cincin (dipanggil dari ISR).
+        Tidak mencetak apa pun; jika buffer penuh, catatan dibuang.
         """
-        current_time = time.ticks_ms()
-        
-        if time.ticks_diff(current_time, self._last_tap_time) > self.debounce_time_ms:
-            # Ini adalah deteksi ketukan yang valid setelah debounce
-            self._tap_detected_flag = True # Set flag untuk loop utama
-            
-            # --- Logika Deteksi Pola Ketukan ---
-            # Jika urutan sudah lengkap, atau jika ini ketukan setelah timeout reset
-            if self._full_sequence_ready: # Kalau sudah selesai, dan ada ketukan lagi, reset saja
-                print(f"[{time.ticks_ms()}] Urutan sudah lengkap, ketukan tambahan terdeteksi. Mereset.")
-                self.reset_sequence()
-            #elif self._current_tap_count == 0 and time.ticks_diff(current_time, self._last_sequence_tap_time) > self.sequence_timeout_ms:
-                # Jika ini ketukan pertama setelah timeout, reset dulu.
-                # Ini penting jika ada timeout di tengah urutan yang gagal dideteksi karena tidak di loop utama
-            #    print(f"[{time.ticks_ms()}] Timeout terdeteksi sebelum ketukan baru. Mereset urutan.")
-            #    self.reset_sequence()
-
-            self._current_tap_count += 1 # Tambah hitungan ketukan fisik setelah potensi reset
-
-            if self._current_tap_count <= self.total_taps_to_expect:
-                if self._current_tap_count == 1:
-                    # Ketukan pertama: selalu pendek (0), ini adalah bit pertama dari 6.
-                    print(f"[{time.ticks_ms()}] Ketukan #1 terdeteksi")
+        head = self._log_head
+        next_head = (head + 1) & (_LOG_SLOTS - 1)
+        if next_head == self._log_tail:
+            return # Buffer penuh, loop utama belum sempat mengosongkan
+        if time_diff > 0xFFFF:
+            time_diff = 0xFFFF
+        struct.pack_into(_LOG_FMT, self._log_buf, head * _LOG_REC_SIZE, tap_count & 0xFF, kind, time_diff)
+        self._log_head = next_head
+
+    def drain_log(self):
+        """
+        Mencetak semua catatan kejadian yang ditulis ISR sejak pemanggilan terakhir.
+        Panggil dari loop utama (bukan dari ISR).
+        """
+        buf = self._log_buf
+        tail = self._log_tail
+        while tail != self._log_head:
+            tap_count, kind, time_diff = struct.unpack_from(_LOG_FMT, buf, tail * _LOG_REC_SIZE)
+            tail = (tail + 1) & (_LOG_SLOTS - 1)
+            if kind == _EV_FIRST:
+                self._log_bits = 0
+                self._log_nbits = 0
+                print("Ketukan #1 terdeteksi")
+            elif kind == _EV_RESET:
+                print("Urutan sudah lengkap, ketukan tambahan terdeteksi. Mereset.")
+            elif kind == _EV_TIMEOUT:
+                print(_FMT_TIMEOUT % self.sequence_timeout_ms)
+            else:
+                bit = 1 if kind == _EV_LONG else 0
+                self._log_bits = (self._log_bits << 1) | bit
+                self._log_nbits += 1
+                label = "Panjang" if bit else "Pendek"
+                sequence = _bits_to_str(self._log_bits, self._log_nbits)
+                if tap_count == self._last_tap_index:
+                    print(_FMT_LAST_TAP % (label, time_diff, sequence))
                 else:
-                    # Hitung jeda dari ketukan sebelumnya dalam urutan
-                    time_diff = time.ticks_diff(current_time, self._last_sequence_tap_time)
-                    
-                    if self._current_tap_count < self.total_taps_to_expect:
-                        # Ketukan ke-2 hingga ke-6. Ini akan menentukan bit 2-6 dari urutan biner.
-                        if time_diff <= self.short_tap_max_delay_ms:
-                            self._current_binary_sequence += "."
-                            print(f"[{time.ticks_ms()}] Ketukan #{self._current_tap_count} (Pendek, jeda: {time_diff}ms). Urutan biner: {self._current_binary_sequence}")
-                        #elif time_diff >= self.long_tap_min_delay_ms:
-                        else:
-                            self._current_binary_sequence += "-"
-                            print(f"[{time.ticks_ms()}] Ketukan #{self._current_tap_count} (Panjang, jeda: {time_diff}ms). Urutan biner: {self._current_binary_sequence}")
-                        #else:
-                            # Jeda tidak sesuai kriteria, reset urutan
-                        #    print(f"[{time.ticks_ms()}] Jeda tidak valid ({time_diff}ms). Urutan direset.")
-                        #    self.reset_sequence()
-                            
-                    elif self._current_tap_count == self.total_taps_to_expect:
-                        # Ini adalah ketukan fisik terakhir (ke-7).
-                        # Ketukan ke-7 ini hanya berfungsi sebagai penentu jeda untuk ketukan ke-6 (bit ke-6).
-                        # Karena permintaan Anda, bit ke-6 (yang dibentuk oleh jeda antara ketukan fisik ke-6 dan ke-7)
-                        # selalu dianggap pendek. Jadi kita hanya perlu memvalidasi jeda.
-                        if time_diff <= self.short_tap_max_delay_ms:
-                            self._current_binary_sequence += "." # Menambahkan bit ke-6 (selalu pendek)
-                            print(f"[{time.ticks_ms()}] Ketukan terakhir (Pendek, jeda: {time_diff}ms). Urutan biner: {self._current_binary_sequence}")
-                            self._full_sequence_ready = True
-                        else:
-                            # Jika jeda terakhir tidak pendek, tetap catat sebagai panjang, tetapi reset urutan
-                            self._current_binary_sequence += "-" # Tetap tambahkan untuk melihat polanya
-                            print(f"[{time.ticks_ms()}] Ketukan terakhir (Panjang, jeda: {time_diff}ms). Urutan biner: {self._current_binary_sequence}")
-                            self._full_sequence_ready = True
-            
-            self._last_sequence_tap_time = current_time # Perbarui waktu ketukan terakhir untuk perhitungan jeda dan timeout
-            self._last_tap_time = current_time # Perbarui waktu terakhir debounce
+                    print(_FMT_TAP % (tap_count, label, time_diff, sequence))
+        self._log_tail = tail
     
     def is_tap_detected(self):
         """
-        Memeriksa apakah ada ketukan baru (setelah debounce) yang terdeteksi.
-        Mengatur ulang flag deteksi setelah diperiksa.
+        Memeriksa apakah ada ketukan baru (setelah debounce) yang terdeteksi
+        sejak pemanggilan terakhir, dengan membandingkan hitungan ketukan urutan.
+        ISR tidak perlu menyimpan flag tambahan untuk ini.
         """
-        if self._tap_detected_flag:
-            self._tap_detected_flag = False 
+        count = self._current_tap_count
+        fresh = count != self._last_seen_count and count != 0 # Hitungan 0 berarti urutan baru saja direset
+        self._last_seen_count = count
+        return fresh
+
+    async def wait_for_activity(self, timeout_ms=None):
+        """
+        Menunggu (tanpa polling) hingga ISR menerima ketukan valid atau timer timeout mereset urutan,
+        atau hingga timeout_ms berlalu. Setelah kembali, panggil drain_log() dan is_sequence_complete().
+
+        :param timeout_ms: Batas waktu tunggu dalam milidetik, atau None untuk menunggu tanpa batas.
+        :return: True jika ada kejadian baru, False jika waktu tunggu habis.
+        """
+        if timeout_ms is None:
+            await self._tap_event.wait()
             return True
-        return False
+        try:
+            await asyncio.wait_for_ms(self._tap_event.wait(), timeout_ms)
+            return True
+        except asyncio.TimeoutError:
+            return False
 
     def check_for_timeout(self):
         """
         Memeriksa apakah ada timeout sejak ketukan terakhir.
         Jika ya, dan ada urutan yang sedang dibangun, urutan akan direset.
+        Timer timeout sudah melakukan ini secara otomatis; metode ini tetap ada untuk pemeriksaan manual.
         """
-        current_time = time.ticks_ms()
-        # Periksa hanya jika ada urutan yang sedang dibangun (bukan kosong atau sudah lengkap)
-        if self._current_tap_count > 0 and not self._full_sequence_ready:
-            if time.ticks_diff(current_time, self._last_sequence_tap_time) > self.sequence_timeout_ms:
-                print(f"[{time.ticks_ms()}] Timeout! Tidak ada ketukan selama {self.sequence_timeout_ms}ms. Urutan direset.")
-                self.reset_sequence()
-                return True
+        # Periksa hanya jika ada urutan yang sedang dibangun (bukan kosong atau sudah lengkap),
+        # sebelum membaca jam: jalur idle yang paling sering tidak perlu membaca ticks_ms()
+        if self._current_tap_count == 0 or self._full_sequence_ready:
+            return False
+        current_time = _ticks_ms()
+        if _ticks_diff(current_time, self._last_sequence_tap_time) > self.sequence_timeout_ms:
+            print("[%d] " % current_time + _FMT_TIMEOUT % self.sequence_timeout_ms)
+            self._reset_state() # Pesan di atas sudah mencakup reset, tidak perlu membaca jam lagi
+            return True
         return False
 
     def is_sequence_complete(self):
@@ -148,12 +322,13 @@ class SoundTapDetector:
         """
         if self._full_sequence_ready:
             # Pastikan urutan biner memiliki panjang yang diharapkan (6 bit)
-            if len(self._current_binary_sequence) == (self.total_taps_to_expect - 1): # 7-1 = 6 bit
+            if self._nbits == self._expected_bits:
                 self._full_sequence_ready = False # Reset flag setelah dibaca
                 return True
             else:
                 # Jika jumlah bit tidak sesuai, mungkin ada masalah logika atau jeda yang terlewat.
-                print(f"[{time.ticks_ms()}] Warning: Urutan biner tidak lengkap ({len(self._current_binary_sequence)} bit) meskipun {self.total_taps_to_expect} ketukan fisik terdeteksi. Mereset.")
+                print("[%d] Warning: Urutan biner tidak lengkap (%d bit) meskipun %d ketukan fisik terdeteksi. Mereset." % (
+                    _ticks_ms(), self._nbits, self.total_taps_to_expect))
                 self.reset_sequence()
                 return False
         return False
@@ -161,8 +336,9 @@ class SoundTapDetector:
     def get_binary_sequence(self):
         """
         Mengembalikan urutan ketukan yang terdeteksi sebagai string biner kustom (misal: ".-..-.").
+        String dibangun dari akumulator bit hanya saat diminta (di luar ISR).
         """
-        return self._current_binary_sequence
+        return _bits_to_str(self._bits, self._nbits)
 
     def binary_sequence_to_integer(self, binary_str=None):
         """
@@ -173,42 +349,54 @@ class SoundTapDetector:
         :return: Integer yang merepresentasikan urutan biner, atau None jika format tidak valid.
         """
         if binary_str is None:
-            binary_str = self._current_binary_sequence
+            # Urutan milik detektor sudah berupa integer di akumulator, tidak perlu parsing string
+            if self._nbits != self._expected_bits:
+                print(_FMT_BAD_LENGTH % (self._nbits, self._expected_bits))
+                return None
+            return self._bits
         
-        if not all(c in ['.', '-'] for c in binary_str):
-            print("Error: String biner kustom mengandung karakter yang tidak valid.")
-            return None
-        
-        # Ganti '.' dengan '0' dan '-' dengan '1'
-        standard_binary_str = binary_str.replace('.', '0').replace('-', '1')
+        # Validasi dan konversi dalam satu lintasan: '.' = 0, '-' = 1
+        value = 0
+        nbits = 0
+        for c in binary_str:
+            if c == '.':
+                value <<= 1
+            elif c == '-':
+                value = (value << 1) | 1
+            else:
+                print("Error: String biner kustom mengandung karakter yang tidak valid.")
+                return None
+            nbits += 1
         
         # Pastikan panjangnya 6 bit untuk konversi yang benar
-        if len(standard_binary_str) != (self.total_taps_to_expect - 1):
-            print(f"Error: Panjang string biner ({len(standard_binary_str)} bit) tidak sesuai (seharusnya {self.total_taps_to_expect - 1} bit).")
-            return None
-
-        # Konversi string biner ke integer
-        try:
-            return int(standard_binary_str, 2)
-        except ValueError:
-            print(f"Error: Gagal mengonversi '{standard_binary_str}' ke integer. Format biner tidak valid.")
+        if nbits != self._expected_bits:
+            print(_FMT_BAD_LENGTH % (nbits, self._expected_bits))
             return None
+        return value
 
     def reset_sequence(self):
         """
         Mengatur ulang urutan ketukan yang sedang dibangun.
         """
-        self._current_binary_sequence = ""
+        self._reset_state()
+        print("[%d] Urutan ketukan direset." % _ticks_ms())
+
+    def _reset_state(self):
+        """Mengatur ulang status urutan tanpa mencetak apa pun (aman dipanggil dari ISR)."""
+        self._bits = 0
+        self._nbits = 0
         self._last_sequence_tap_time = 0 # Reset waktu terakhir ke 0 agar timeout dimulai dari 0 saat ketukan pertama
         self._full_sequence_ready = False
         self._current_tap_count = 0
-        print(f"[{time.ticks_ms()}] Urutan ketukan direset.")
+        self._state = self._st_first
 
     def deactivate(self):
         """
-        Menonaktifkan interupsi pada pin sensor.
+        Menonaktifkan interupsi pada pin sensor dan timer timeout.
         """
         self.pin.irq(handler=None)
+        self._timeout_timer.deinit()
+        _timers_in_use.discard(self._timer_id) # Timer boleh dipakai detektor lain
         print(f"SoundTapDetector pada GPIO{self.pin_number} dinonaktifkan.")
 
     def __repr__(self):
@@ -248,14 +436,16 @@ if __name__ == "__main__":
     print(f"Ketukan pertama dianggap pendek ('.'). Jeda yang tidak valid atau timeout akan mereset urutan.")
     print("Jeda sangat cepat (di bawah debounce) akan diabaikan.")
 
-    try:
+    async def main():
         while True:
-            # Periksa timeout di loop utama
-            detector.check_for_timeout()
+            # Tidur sampai ISR memberi sinyal ketukan atau timer timeout mereset urutan
+            await detector.wait_for_activity()
+            # Cetak kejadian yang dicatat ISR dan timer
+            detector.drain_log()
 
             if detector.is_sequence_complete():
                 binary_sequence = detector.get_binary_sequence()
-                integer_value = detector.binary_sequence_to_integer(binary_sequence)
+                integer_value = detector.binary_sequence_to_integer() # Jalur cepat: langsung dari akumulator bit
                 
                 print(f"\n*** URUTAN KETUKAN LENGKAP TERDETEKSI! ***")
                 print(f"Pola Biner: {binary_sequence}")
@@ -268,9 +458,9 @@ if __name__ == "__main__":
                 
                 detector.reset_sequence()
                 print("\nMenunggu urutan ketukan baru...")
-            
-            time.sleep_ms(50) # Jeda singkat untuk menghemat daya CPU
-            
+
+    try:
+        asyncio.run(main())
     except KeyboardInterrupt:
         print("\nProgram dihentikan oleh pengguna.")
     finally: